@@ -1,14 +1,30 @@
 import os
 import re
+import reprlib
 import asyncio
+import itertools
 import logging
-from typing import Any, Dict, Optional
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
 from urllib.parse import urlparse
 
-import requests
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+import httpx
+import orjson
+from telegram import Message, Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
 
+try:
+    import uvloop
+except ImportError:  # Windows / локальний запуск без uvloop
+    uvloop = None
+
+try:
+    # Playwright — лише запасний шлях на випадок JS-челенджу; Chromium ставить buildCommand у render.yaml
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
 
 # -------------------------
 # LOGGING (Render Logs)
@@ -25,23 +41,34 @@ log = logging.getLogger("dtek-bot")
 # -------------------------
 BOT_TOKEN = os.getenv("BOT_TOKEN", "").strip()
 
-ADDRESSES: Dict[str, Dict[str, str]] = {
-    "HOME": {
-        "label": "💡 Світло — Дім",
-        "page_url": "https://www.dtek-krem.com.ua/ua/shutdowns",
-        "ajax_url": "https://www.dtek-krem.com.ua/ua/ajax",
-        "city": "с. Нове",
-        "street": "вул. Незалежності",
-        "house": "26",
-    },
-    "MOM": {
-        "label": "💡 Світло — Мама",
-        "page_url": "https://www.dtek-kem.com.ua/ua/shutdowns",
-        "ajax_url": "https://www.dtek-kem.com.ua/ua/ajax",
-        "city": "м. Київ",
-        "street": "вул. Антоновича",
-        "house": "88",
-    },
+
+@dataclass(slots=True, frozen=True)
+class AddressCfg:
+    label: str
+    page_url: str
+    ajax_url: str
+    city: str
+    street: str
+    house: str
+
+
+ADDRESSES: Dict[str, AddressCfg] = {
+    "HOME": AddressCfg(
+        label="💡 Світло — Дім",
+        page_url="https://www.dtek-krem.com.ua/ua/shutdowns",
+        ajax_url="https://www.dtek-krem.com.ua/ua/ajax",
+        city="с. Нове",
+        street="вул. Незалежності",
+        house="26",
+    ),
+    "MOM": AddressCfg(
+        label="💡 Світло — Мама",
+        page_url="https://www.dtek-kem.com.ua/ua/shutdowns",
+        ajax_url="https://www.dtek-kem.com.ua/ua/ajax",
+        city="м. Київ",
+        street="вул. Антоновича",
+        house="88",
+    ),
 }
 
 UA = (
@@ -52,6 +79,99 @@ UA = (
 TIMEOUT = 40
 RETRIES = 2
 
+# ознаки того, що замість сторінки прийшла JS-перевірка (Cloudflare тощо)
+JS_CHALLENGE_MARKERS = ("cf-chl", "challenge-platform", "cf_chl_opt")
+
+_CSRF_RE = re.compile(r'<meta\s+name="csrf-token"\s+content="([^"]+)"', re.I)
+# updateFact / updateTimestamp у JSON ("key": "v") або JS (key = "v") — один прохід
+_UPDATE_FACT_RE = re.compile(r'(?:updateFact|updateTimestamp)(?:"\s*:|\s*=)\s*"([^"]+)"')
+
+# один клієнт на весь процес: cookies + keep-alive між натисканнями
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+# відповідь /ajax на (page_url, city, street): updateTimestamp хвилинний, повтор у межах TTL дасть те саме
+JSON_CACHE_TTL = 30
+_JSON_CACHE: Dict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]] = {}
+_JSON_LOCKS: Dict[Tuple[str, str, str], asyncio.Lock] = {}
+
+# page_url -> (чи потрібен csrf для /ajax, коли перевірено); True — лише після
+# відмови POST без нього (4xx, крім 429 і JS-челенджу), і лише на CSRF_RECHECK_TTL
+_CSRF_REQUIRED: Dict[str, Tuple[bool, float]] = {}
+CSRF_RECHECK_TTL = 60 * 60
+# як часто POST без csrf освіжає updateFact зі сторінки
+UPDATE_FACT_MAX_AGE = 10 * 60
+
+# обмежений repr відповіді для повідомлень про помилку — без str() усього JSON
+_SHORT_REPR = reprlib.Repr()
+_SHORT_REPR.maxlevel = 2
+_SHORT_REPR.maxdict = 3
+_SHORT_REPR.maxlist = 3
+_SHORT_REPR.maxstring = 80
+_SHORT_REPR.maxother = 100
+
+# у запасному браузері потрібен лише HTML + скрипти челенджу
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "stylesheet", "media", "other"})
+
+# мінімум підсистем Chromium — на free-інстансі Render мало RAM
+CHROMIUM_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-features=Translate,BackForwardCache",
+    "--mute-audio",
+    # не пам'ять: без цього прапорця navigator.webdriver видає бота JS-челенджу,
+    # заради якого цей браузер і запускається
+    "--disable-blink-features=AutomationControlled",
+]
+
+HTML_HEAD_BYTES = 64 * 1024
+
+# page_url -> (fetched_at, etag, csrf, update_fact): csrf стабільний у межах сесії
+PAGE_CACHE_TTL = 60
+_PAGE_CACHE: Dict[str, Tuple[float, str, str, str]] = {}
+
+# Chromium для запасного шляху: запускається один раз при першій потребі
+_PW: Any = None
+_BROWSER: Any = None
+_BROWSER_LOCK = asyncio.Lock()
+
+
+class DtekError(RuntimeError):
+    """
+    Неочікувана відповідь DTEK. CT і початок тіла зберігаються окремо
+    й потрапляють у текст лише в details(), коли помилку показують користувачу.
+    """
+
+    def __init__(self, message: str, status: int, ct: str, text: str) -> None:
+        super().__init__(f"{message} HTTP={status}")
+        self.status = status
+        self.ct = ct
+        self.text = text[:300]
+
+    def details(self) -> str:
+        return f"{self} CT={self.ct} TEXT={self.text}"
+
+
+def _error_text(e: BaseException) -> str:
+    return e.details() if isinstance(e, DtekError) else str(e)
+
+
+class _LazyErrorText:
+    """_error_text(e) для логів: рендериться лише коли запис справді форматується."""
+
+    __slots__ = ("e",)
+
+    def __init__(self, e: BaseException) -> None:
+        self.e = e
+
+    def __str__(self) -> str:
+        return _error_text(self.e)
+
+
+class JsChallengeError(RuntimeError):
+    """DTEK віддав JS-челендж замість HTML/JSON — потрібен справжній браузер."""
+
 
 # -------------------------
 # HELPERS
@@ -62,60 +182,50 @@ def _origin(url: str) -> str:
 
 
 def _extract_csrf(html: str) -> Optional[str]:
-    m = re.search(r'<meta\s+name="csrf-token"\s+content="([^"]+)"', html, re.I)
+    m = _CSRF_RE.search(html)
     return m.group(1) if m else None
 
 
 def _extract_update_fact(html: str) -> str:
-    patterns = [
-        r'updateFact"\s*:\s*"([^"]+)"',
-        r'updateTimestamp"\s*:\s*"([^"]+)"',
-        r'updateFact\s*=\s*"([^"]+)"',
-        r'updateTimestamp\s*=\s*"([^"]+)"',
-    ]
-    for p in patterns:
-        m = re.search(p, html)
-        if m:
-            return m.group(1)
-    return ""
-
-
-def _session() -> requests.Session:
-    s = requests.Session()
-    # можно добавить базовые заголовки в сессию
-    s.headers.update(
-        {
-            "User-Agent": UA,
-            "Accept-Language": "uk-UA,uk;q=0.9,ru;q=0.8,en;q=0.7",
-            "Connection": "keep-alive",
-        }
-    )
-    return s
+    m = _UPDATE_FACT_RE.search(html)
+    return m.group(1) if m else ""
+
+
+def _client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        # пул як у HTTPAdapter(pool_connections=4, pool_maxsize=8);
+        # retries на транспорті — повтор лише невдалих з'єднань, 5xx/не-JSON ловить цикл у fetch_current_outage
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=2,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+        )
+        _CLIENT = httpx.AsyncClient(
+            transport=transport,
+            timeout=TIMEOUT,
+            follow_redirects=True,
+            headers={
+                "User-Agent": UA,
+                "Accept-Language": "uk-UA,uk;q=0.9,ru;q=0.8,en;q=0.7",
+            },
+        )
+    return _CLIENT
 
 
-def _fetch_current_outage_sync(
-    page_url: str, ajax_url: str, city: str, street: str
-) -> Dict[str, Any]:
-    """
-    1) GET сторінки => cookies + csrf + updateFact
-    2) POST /ajax method=getHomeNum
-    """
-    s = _session()
+async def _close_client() -> None:
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
 
-    # --- 1) GET
-    headers_get = {
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    }
 
-    r = s.get(page_url, headers=headers_get, timeout=TIMEOUT)
-    r.raise_for_status()
-    html = r.text
+def _looks_like_js_challenge(text: str) -> bool:
+    return any(m in text for m in JS_CHALLENGE_MARKERS)
 
-    csrf = _extract_csrf(html)
-    update_fact = _extract_update_fact(html)
 
-    # --- 2) POST
-    headers_post = {
+def _post_headers(page_url: str, csrf: Optional[str]) -> Dict[str, str]:
+    headers = {
         "Accept": "application/json, text/javascript, */*; q=0.01",
         "X-Requested-With": "XMLHttpRequest",
         "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
@@ -123,9 +233,12 @@ def _fetch_current_outage_sync(
         "Origin": _origin(page_url),
     }
     if csrf:
-        headers_post["X-CSRF-Token"] = csrf
+        headers["X-CSRF-Token"] = csrf
+    return headers
 
-    form = {
+
+def _build_form(city: str, street: str, update_fact: str) -> Dict[str, str]:
+    return {
         "method": "getHomeNum",
         "data[0][name]": "city",
         "data[0][value]": city,
@@ -135,17 +248,239 @@ def _fetch_current_outage_sync(
         "data[2][value]": update_fact,
     }
 
-    rr = s.post(ajax_url, data=form, headers=headers_post, timeout=TIMEOUT)
-    ct = (rr.headers.get("content-type") or "").lower()
-    text = rr.text or ""
+
+def _body_excerpt(body: bytes) -> str:
+    # 1200 байт гарантовано дають >= 300 символів UTF-8 для DtekError
+    return body[:1200].decode("utf-8", errors="replace")
+
+
+def _is_json_response(ct: str, body: bytes) -> bool:
+    return "application/json" in (ct or "").lower() or body.lstrip().startswith(b"{")
+
+
+def _check_json_response(status: int, ct: str, body: bytes) -> None:
+    """Тіло декодується в str лише тоді, коли відповідь не та, що треба."""
+    ct = (ct or "").lower()
+    if status != 200:
+        raise DtekError("DTEK", status, ct, _body_excerpt(body))
+
+    if not _is_json_response(ct, body):
+        raise DtekError("DTEK повернув НЕ JSON.", status, ct, _body_excerpt(body))
+
+
+async def _get_page_tokens(page_url: str) -> Tuple[Optional[str], str]:
+    """
+    csrf + updateFact зі сторінки, з кешем на PAGE_CACHE_TTL секунд.
+    Після TTL — умовний GET з If-None-Match, на 304 беремо старі значення.
+    """
+    now = time.time()
+    cached = _PAGE_CACHE.get(page_url)
+    if cached and now - cached[0] < PAGE_CACHE_TTL:
+        return cached[2] or None, cached[3]
+
+    headers_get = {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    }
+    if cached and cached[1]:
+        headers_get["If-None-Match"] = cached[1]
+
+    # csrf/updateFact лежать на початку сторінки: по HTTP/2 читаємо перші HTML_HEAD_BYTES,
+    # решту тіла — лише якщо updateFact там не знайшовся. По HTTP/1.1 недочитане тіло
+    # змушує httpcore закрити з'єднання, тож там тіло читається повністю заради keep-alive.
+    async with _client().stream("GET", page_url, headers=headers_get) as r:
+        if cached and r.status_code == 304:
+            _PAGE_CACHE[page_url] = (now, cached[1], cached[2], cached[3])
+            return cached[2] or None, cached[3]
+
+        truncated = r.http_version == "HTTP/2"
+        if truncated:
+            chunks = r.aiter_bytes()
+            buf = bytearray()
+            async for chunk in chunks:
+                buf += chunk
+                if len(buf) >= HTML_HEAD_BYTES:
+                    break
+        else:
+            buf = bytearray(await r.aread())
+        encoding = r.encoding or "utf-8"
+        html = buf.decode(encoding, errors="ignore")
+
+        if _looks_like_js_challenge(html):
+            raise JsChallengeError(f"DTEK JS-челендж на GET (HTTP={r.status_code})")
+        r.raise_for_status()
+
+        csrf = _extract_csrf(html)
+        update_fact = _extract_update_fact(html)
+        if not update_fact and truncated:
+            # дочитуємо й скануємо лише хвіст (з невеликим перекриттям на стик)
+            tail_start = max(len(buf) - 256, 0)
+            async for chunk in chunks:
+                buf += chunk
+            tail = buf[tail_start:].decode(encoding, errors="ignore")
+            csrf = csrf or _extract_csrf(tail)
+            update_fact = _extract_update_fact(tail)
+
+    _PAGE_CACHE[page_url] = (now, r.headers.get("etag", ""), csrf or "", update_fact)
+    return csrf, update_fact
+
+
+async def _post_only(
+    page_url: str, ajax_url: str, city: str, street: str
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    POST /ajax без csrf і без cookies.
+    Повертає (csrf_rejected, JSON); JSON = None — якщо DTEK такий запит не прийняв,
+    csrf_rejected = True — лише якщо це справжня відмова (4xx, не 429 і не челендж).
+    updateFact береться з кешу сторінки; раз на UPDATE_FACT_MAX_AGE сторінка
+    перечитується (умовним GET), щоб він не застарів.
+    """
+    cached = _PAGE_CACHE.get(page_url)
+    if cached and time.time() - cached[0] < UPDATE_FACT_MAX_AGE:
+        update_fact = cached[3]
+    else:
+        _, update_fact = await _get_page_tokens(page_url)
+
+    client = _client()
+    req = client.build_request(
+        "POST",
+        ajax_url,
+        data=_build_form(city, street, update_fact),
+        headers=_post_headers(page_url, None),
+    )
+    req.headers.pop("Cookie", None)
+    rr = await client.send(req)
 
     if rr.status_code != 200:
-        raise RuntimeError(f"DTEK HTTP={rr.status_code} CT={ct} TEXT={text[:300]}")
+        rejected = (
+            400 <= rr.status_code < 500
+            and rr.status_code != 429
+            and not _looks_like_js_challenge(rr.text)
+        )
+        return rejected, None
 
-    if "application/json" not in ct and not text.lstrip().startswith("{"):
-        raise RuntimeError(f"DTEK повернув НЕ JSON. CT={ct} TEXT={text[:300]}")
+    if not _is_json_response(rr.headers.get("content-type", ""), rr.content):
+        return False, None
 
-    return rr.json()
+    try:
+        api_json = orjson.loads(rr.content)
+    except orjson.JSONDecodeError:
+        return False, None
+    if not isinstance(api_json, dict) or not api_json.get("result"):
+        return False, None
+    return False, api_json
+
+
+async def _fetch_current_outage_http(
+    page_url: str, ajax_url: str, city: str, street: str
+) -> Dict[str, Any]:
+    """
+    0) якщо csrf для цього сайту не потрібен (або ще не перевіряли) — один POST
+    1) GET сторінки => cookies + csrf + updateFact (з кешу, якщо свіжі)
+    2) POST /ajax method=getHomeNum
+    """
+    # --- 0) POST без csrf
+    flag = _CSRF_REQUIRED.get(page_url)
+    required = flag[0] if flag else None
+    if required and time.monotonic() - flag[1] >= CSRF_RECHECK_TTL:
+        required = None  # давно перевіряли — пробуємо ще раз
+
+    if required is not True:
+        rejected, api_json = await _post_only(page_url, ajax_url, city, street)
+        if api_json is not None:
+            if required is None:
+                log.info("DTEK %s приймає POST без csrf — пропускаю GET сторінки", page_url)
+            _CSRF_REQUIRED[page_url] = (False, time.monotonic())
+            return api_json
+        if rejected:
+            if required is False:
+                log.info("DTEK %s знову вимагає csrf", page_url)
+            _CSRF_REQUIRED[page_url] = (True, time.monotonic())
+        # 5xx / 429 / челендж / result=false — прапорець не чіпаємо, цього разу GET+POST
+
+    # --- 1) GET
+    csrf, update_fact = await _get_page_tokens(page_url)
+
+    # --- 2) POST
+    rr = await _client().post(
+        ajax_url,
+        data=_build_form(city, street, update_fact),
+        headers=_post_headers(page_url, csrf),
+    )
+    body = rr.content
+    if rr.status_code != 200:
+        # токен міг протухнути — наступна спроба перечитає сторінку
+        _PAGE_CACHE.pop(page_url, None)
+        if _looks_like_js_challenge(rr.text):
+            raise JsChallengeError(f"DTEK JS-челендж на POST (HTTP={rr.status_code})")
+
+    _check_json_response(rr.status_code, rr.headers.get("content-type", ""), body)
+    return orjson.loads(body)
+
+
+async def _get_browser() -> Any:
+    global _PW, _BROWSER
+    async with _BROWSER_LOCK:
+        if _BROWSER is None or not _BROWSER.is_connected():
+            if _PW is None:
+                _PW = await async_playwright().start()
+            _BROWSER = await _PW.chromium.launch(
+                headless=True, args=CHROMIUM_ARGS, chromium_sandbox=False
+            )
+            log.info("Chromium launched")
+        return _BROWSER
+
+
+async def _close_browser() -> None:
+    global _PW, _BROWSER
+    if _BROWSER is not None:
+        await _BROWSER.close()
+        _BROWSER = None
+    if _PW is not None:
+        await _PW.stop()
+        _PW = None
+
+
+async def _route_filter(route: Any) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _fetch_current_outage_browser(
+    page_url: str, ajax_url: str, city: str, street: str
+) -> Dict[str, Any]:
+    """
+    Запасний шлях через Chromium: спершу HTML через ctx.request (без рендеру),
+    і лише якщо там челендж — справжня сторінка, щоб JS його пройшов.
+    POST іде з cookies цього ж контексту.
+    Браузер спільний, на кожен запит — свіжий BrowserContext.
+    """
+    browser = await _get_browser()
+    ctx = await browser.new_context(user_agent=UA)
+    try:
+        await ctx.route("**/*", _route_filter)
+        r = await ctx.request.get(page_url, timeout=TIMEOUT * 1000)
+        html = await r.text()
+        if _looks_like_js_challenge(html):
+            page = await ctx.new_page()
+            await page.goto(page_url, wait_until="networkidle", timeout=TIMEOUT * 1000)
+            html = await page.content()
+
+        csrf = _extract_csrf(html)
+        update_fact = _extract_update_fact(html)
+
+        resp = await ctx.request.post(
+            ajax_url,
+            form=_build_form(city, street, update_fact),
+            headers=_post_headers(page_url, csrf),
+            timeout=TIMEOUT * 1000,
+        )
+        body = await resp.body()
+        _check_json_response(resp.status, resp.headers.get("content-type", ""), body)
+        return orjson.loads(body)
+    finally:
+        await ctx.close()
 
 
 async def fetch_current_outage(
@@ -154,9 +489,13 @@ async def fetch_current_outage(
     last_err: Optional[Exception] = None
     for attempt in range(RETRIES + 1):
         try:
-            return await asyncio.to_thread(
-                _fetch_current_outage_sync, page_url, ajax_url, city, street
-            )
+            try:
+                return await _fetch_current_outage_http(page_url, ajax_url, city, street)
+            except JsChallengeError as e:
+                if async_playwright is None:
+                    raise
+                log.warning("%s — пробую через Chromium", e)
+                return await _fetch_current_outage_browser(page_url, ajax_url, city, street)
         except Exception as e:
             last_err = e
             log.warning("DTEK fetch failed (attempt %s/%s): %s", attempt + 1, RETRIES + 1, e)
@@ -165,15 +504,40 @@ async def fetch_current_outage(
     raise last_err if last_err else RuntimeError("Unknown DTEK error")
 
 
+async def get_current_outage(
+    page_url: str, ajax_url: str, city: str, street: str
+) -> Dict[str, Any]:
+    """
+    fetch_current_outage з кешем на JSON_CACHE_TTL секунд.
+    Одночасні кліки по тій самій адресі чекають один спільний запит.
+    """
+    key = (page_url, city, street)
+    lock = _JSON_LOCKS.setdefault(key, asyncio.Lock())
+    async with lock:
+        cached = _JSON_CACHE.get(key)
+        if cached and time.monotonic() - cached[0] < JSON_CACHE_TTL:
+            return cached[1]
+
+        api_json = await fetch_current_outage(page_url, ajax_url, city, street)
+        # result=false — відмова DTEK, її не кешуємо, наступний клік спробує знову
+        if api_json.get("result"):
+            _JSON_CACHE[key] = (time.monotonic(), api_json)
+        return api_json
+
+
 def format_current_outage(api_json: Dict[str, Any], house: str) -> str:
     if not api_json.get("result"):
         return "❌ API повернув result=false (DTEK не прийняв запит або немає даних)"
 
     data = api_json.get("data", {}) or {}
-    rec = data.get(house) or data.get("") or next(iter(data.values()), None)
+    if data and house not in data and "" not in data:
+        some_keys = ", ".join(map(str, itertools.islice(data, 20)))
+        return f"❌ Будинку {house} немає у відповіді DTEK. Є: {some_keys}"
+
+    rec = data.get(house) if house in data else data.get("")
 
     if not isinstance(rec, dict):
-        return f"❌ Не можу знайти дані по будинку. Відповідь: {str(api_json)[:250]}"
+        return f"❌ Не можу знайти дані по будинку. Відповідь: {_SHORT_REPR.repr(api_json)[:250]}"
 
     sub_type = rec.get("sub_type") or "—"
     start_date = rec.get("start_date") or "—"
@@ -196,13 +560,44 @@ def format_current_outage(api_json: Dict[str, Any], house: str) -> str:
     )
 
 
-def build_keyboard() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
-        [
-            [InlineKeyboardButton(ADDRESSES["HOME"]["label"], callback_data="LIGHT_HOME")],
-            [InlineKeyboardButton(ADDRESSES["MOM"]["label"], callback_data="LIGHT_MOM")],
-        ]
+# клавіатура незмінна — будуємо один раз
+KEYBOARD = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton(ADDRESSES["HOME"].label, callback_data="LIGHT_HOME")],
+        [InlineKeyboardButton(ADDRESSES["MOM"].label, callback_data="LIGHT_MOM")],
+        [InlineKeyboardButton("💡 Обидві адреси", callback_data="LIGHT_BOTH")],
+    ]
+)
+
+
+async def check_address(key: str) -> str:
+    cfg = ADDRESSES[key]
+    api_json = await get_current_outage(
+        cfg.page_url, cfg.ajax_url, cfg.city, cfg.street
     )
+    msg = format_current_outage(api_json, cfg.house)
+    return f"{cfg.label}\n\n{msg}"
+
+
+async def check_all_addresses() -> str:
+    """Усі адреси паралельно: час ≈ найповільніший запит, а не сума."""
+    keys = list(ADDRESSES)
+    results = await asyncio.gather(*(check_address(k) for k in keys), return_exceptions=True)
+
+    parts = []
+    for key, res in zip(keys, results):
+        if isinstance(res, BaseException) and not isinstance(res, Exception):
+            raise res  # CancelledError тощо — не ковтаємо
+        if isinstance(res, Exception):
+            log.error("Check %s failed: %s", key, _LazyErrorText(res), exc_info=res)
+            res = f"{ADDRESSES[key].label}\n\nНе вдалося отримати дані 😕\nПомилка: {_error_text(res)}"
+        parts.append(res)
+    return "\n\n".join(parts)
+
+
+async def reply_all_addresses(message: Message) -> None:
+    await message.reply_text("⏳ Перевіряю обидві адреси…")
+    await message.reply_text(await check_all_addresses())
 
 
 # -------------------------
@@ -212,7 +607,14 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     msg = update.effective_message
     if not msg:
         return
-    await msg.reply_text("Обери адресу:", reply_markup=build_keyboard())
+    await msg.reply_text("Обери адресу:", reply_markup=KEYBOARD)
+
+
+async def both(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    msg = update.effective_message
+    if not msg:
+        return
+    await reply_all_addresses(msg)
 
 
 async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -222,49 +624,69 @@ async def on_button(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
     await q.answer()
 
+    if q.data == "LIGHT_BOTH":
+        if q.message:
+            await reply_all_addresses(q.message)
+        return
+
     key = "HOME" if q.data == "LIGHT_HOME" else "MOM" if q.data == "LIGHT_MOM" else None
     if not key:
         if q.message:
             await q.message.reply_text("Невідома кнопка 😅")
         return
 
-    cfg = ADDRESSES[key]
-
     # сразу покажем "думаю" (по желанию)
     if q.message:
         await q.message.reply_text("⏳ Перевіряю…")
 
     try:
-        api_json = await fetch_current_outage(
-            cfg["page_url"], cfg["ajax_url"], cfg["city"], cfg["street"]
-        )
-        msg = format_current_outage(api_json, cfg["house"])
+        text = await check_address(key)
         if q.message:
-            await q.message.reply_text(f"{cfg['label']}\n\n{msg}")
+            await q.message.reply_text(text)
     except Exception as e:
-        log.exception("Button handler error: %s", e)
+        log.exception("Button handler error: %s", _LazyErrorText(e))
         if q.message:
             await q.message.reply_text(
                 "Не вдалося отримати дані 😕\n"
-                f"Помилка: {e}"
+                f"Помилка: {_error_text(e)}"
             )
 
 
 # -------------------------
 # MAIN
 # -------------------------
+async def on_startup(app: Application) -> None:
+    # клієнт створюється вже всередині робочого event loop
+    _client()
+
+
+async def on_shutdown(app: Application) -> None:
+    await _close_client()
+    await _close_browser()
+
+
 def main() -> None:
     if not BOT_TOKEN:
         raise RuntimeError("BOT_TOKEN не знайдено. Додай його в Render -> Environment як BOT_TOKEN.")
 
     # ✅ FIX для Python 3.14 (Render): вручну створюємо event loop
-    loop = asyncio.new_event_loop()
+    # (libuv-цикл, якщо є uvloop — швидший за стандартний на сокетах)
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
     log.info("Starting bot...")
 
-    app = Application.builder().token(BOT_TOKEN).build()
+    app = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        # кожен апдейт — окрема задача: повільний запит до DTEK не блокує інших
+        .concurrent_updates(True)
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
     app.add_handler(CommandHandler("start", start))
+    app.add_handler(CommandHandler("both", both))
     app.add_handler(CallbackQueryHandler(on_button))
 
     # stop_signals=None — чтобы Render не ломался на сигналах